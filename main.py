@@ -0,0 +1,32 @@
+"""Entry point: wire the pipeline components together and launch the GUI."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.core.file_hash_cache import FileHashCache
+from src.core.pipeline_engine import PipelineEngine
+from src.core.plugin_manager import PluginManager
+from src.gui.main_window import ValidationPipelineGUI, create_root
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def main() -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    hash_cache = FileHashCache(DATA_DIR / "cache.json")
+    hash_cache.load()
+    plugin_manager = PluginManager()
+    plugin_manager.discover()
+    engine = PipelineEngine(
+        plugin_manager,
+        hash_cache,
+        output_dir=DATA_DIR / "validated",
+        log_path=DATA_DIR / "pipeline_errors.jsonl",
+    )
+    root = create_root()
+    ValidationPipelineGUI(root, engine)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,41 @@
-"""Placeholder implementations for the pipeline engine layer."""
+"""Pipeline engine: isolation, run IDs, reporting, incremental validation."""
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from src.core.file_hash_cache import FileHashCache
 from src.core.plugin_manager import PluginManager
+from src.utils.jsonl_manager import JSONLManager
 from src.utils.types import PipelineReport, PluginResult
 
+#: Crockford base32 alphabet used for ULID encoding; bound once at module
+#: scope so _generate_ulid does not rebuild it per call.
+_CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_CROCKFORD32_BYTES = _CROCKFORD32.encode("ascii")
+
+#: 256-entry lookup table mapping any byte to the base32 character of its
+#: low five bits; lets bytes.translate encode the random part at C speed.
+_ULID_RANDOM_LUT = bytes(_CROCKFORD32_BYTES[b & 0x1F] for b in range(256))
+
+#: Bit shifts extracting the ten 5-bit groups of the 48-bit millisecond
+#: timestamp, most significant first.
+_ULID_TIME_SHIFTS = tuple(range(45, -1, -5))
+
+#: Checkpoint the hash cache after this many completed files so a crash
+#: mid-batch loses at most one checkpoint's worth of validations.
+_CACHE_CHECKPOINT = 32
+
 
 class PipelineEngine:
     """Co-ordinates validation work across the GUI and plugin system."""
@@ -16,30 +44,336 @@ class PipelineEngine:
         self,
         plugin_manager: PluginManager,
         hash_cache: FileHashCache,
+        output_dir: Optional[Path] = None,
+        log_path: Optional[Path] = None,
+        preserve_metadata: bool = False,
     ) -> None:
         self._plugin_manager = plugin_manager
         self._hash_cache = hash_cache
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        # Opt-in copystat on output copies; leaving it off keeps copies on
+        # shutil.copyfile, which uses sendfile's in-kernel path on Linux.
+        self.preserve_metadata = preserve_metadata
+        self.aggregated_log = JSONLManager(log_path) if log_path is not None else None
+        # Independent files run fully in parallel; only concurrent work on
+        # the *same* path serializes, via a per-path lock. The weak dict
+        # drops a lock once no worker holds it.
+        self._path_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._path_locks_guard = threading.Lock()
+        # Cache persistence is batched: per-file work only marks entries
+        # dirty, process_files flushes once at the end, and the atexit hook
+        # does the only fsync'd (strict) flush at graceful shutdown.
+        atexit.register(self._hash_cache.save, strict=True)
+
+    def process_files(
+        self,
+        file_paths: Iterable[Path],
+        output_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[PipelineReport], None]] = None,
+    ) -> List[PipelineReport]:
+        """Process a batch of files through the validation pipeline.
 
-    def process_files(self, file_paths: Iterable[Path]) -> List[PipelineReport]:
-        """Process a batch of files through the validation pipeline."""
-        reports: List[PipelineReport] = []
-        for file_path in file_paths:
-            reports.append(self.process_file(file_path))
-        return reports
+        Files are processed concurrently: hashing, file copies, and plugin
+        subprocesses all release the GIL, so per-file work overlaps almost
+        perfectly. Results are returned in input order. ``max_workers``
+        overrides the CPU-derived pool size, and ``progress_callback``
+        receives each report as results are collected — callers like the
+        GUI use it to stream per-file status without waiting for the batch.
+        """
+        paths = [Path(p) for p in file_paths]
+        try:
+            # One staging directory for the whole batch: per-file work only
+            # creates files inside it, avoiding a mkdtemp/rmtree pair per file.
+            with tempfile.TemporaryDirectory(prefix="pipeline_") as tmp_dir:
+                tmp_root = Path(tmp_dir)
+                if len(paths) <= 1:
+                    reports = [
+                        self.process_file(p, output_dir=output_dir, tmp_root=tmp_root)
+                        for p in paths
+                    ]
+                    if progress_callback is not None:
+                        for report in reports:
+                            progress_callback(report)
+                    return reports
+                if max_workers is None:
+                    max_workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self.process_file, p, output_dir, tmp_root)
+                        for p in paths
+                    ]
+                    reports = []
+                    for index, future in enumerate(futures, start=1):
+                        report = future.result()
+                        reports.append(report)
+                        if progress_callback is not None:
+                            progress_callback(report)
+                        if index % _CACHE_CHECKPOINT == 0:
+                            self._hash_cache.save()
+                    return reports
+        finally:
+            self._hash_cache.save()
 
-    def process_file(self, file_path: Path) -> PipelineReport:
-        """Validate a single file using the registered plugins."""
-        raise NotImplementedError("PipelineEngine.process_file is not implemented yet")
+    def process_file(
+        self,
+        file_path: Path,
+        output_dir: Optional[Path] = None,
+        tmp_root: Optional[Path] = None,
+    ) -> PipelineReport:
+        """Validate a single file using the registered plugins.
 
-    def _run_plugins(self, file_path: Path) -> List[PluginResult]:
-        """Execute all applicable plugins for the given file."""
-        raise NotImplementedError("PipelineEngine._run_plugins is not implemented yet")
+        Per-file failures are contained here: a file that disappeared or
+        blew up mid-validation yields a ``missing``/``error`` report (the
+        statuses the GUI counts as failures) instead of propagating out of
+        ``future.result()`` and aborting the rest of the batch.
+        """
+        file_path = Path(file_path).resolve()
+        with self._path_locks_guard:
+            path_lock = self._path_locks.get(str(file_path))
+            if path_lock is None:
+                path_lock = threading.Lock()
+                self._path_locks[str(file_path)] = path_lock
+        with path_lock:
+            try:
+                return self._process_file_locked(file_path, output_dir, tmp_root)
+            except FileNotFoundError as exc:
+                return self._failure_report(file_path, "missing", str(exc))
+            except Exception as exc:  # noqa: BLE001 - one file must not kill the batch
+                return self._failure_report(file_path, "error", str(exc))
+
+    def _failure_report(
+        self, file_path: Path, status: str, message: str
+    ) -> PipelineReport:
+        """Build the report for a file that never produced plugin results."""
+        return PipelineReport(
+            file_in=file_path,
+            file_out=None,
+            run_id=self._generate_ulid(),
+            plugin_results=(),
+            summary={
+                "status": status,
+                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                "message": message,
+                "plugins_run": 0,
+                "total_errors": 1,
+                "total_warnings": 0,
+                "auto_fixed": 0,
+            },
+        )
+
+    def _process_file_locked(
+        self,
+        file_path: Path,
+        output_dir: Optional[Path],
+        tmp_root: Optional[Path],
+    ) -> PipelineReport:
+        run_id = self._generate_ulid()
+        if not self._hash_cache.has_changed(file_path):
+            return PipelineReport(
+                file_in=file_path,
+                file_out=None,
+                run_id=run_id,
+                plugin_results=(),
+                summary={"status": "skipped", "reason": "unchanged"},
+            )
+        timestamp = datetime.now(timezone.utc)
+        # Format once; the report summary, every aggregated log record, and
+        # the cache entry all share the same timestamp string.
+        timestamp_iso = timestamp.isoformat()
+        output_root = Path(output_dir) if output_dir is not None else self.output_dir
+        file_out: Optional[Path] = None
+        if output_root is not None:
+            output_root.mkdir(parents=True, exist_ok=True)
+            stamp = timestamp.strftime("%Y%m%d_%H%M%S")
+            # The ULID's leading characters encode the timestamp and stay
+            # constant for minutes; the random tail is what actually makes
+            # same-stem outputs from the same second distinct.
+            file_out = output_root / (
+                f"{file_path.stem}_VALIDATED_{stamp}_{run_id[-6:]}{file_path.suffix}"
+            )
+        plugins = self._plugin_manager.get_plugins_for_file(file_path)
+        if any(getattr(plugin, "mutates_input", True) for plugin in plugins):
+            # At least one plugin may rewrite the file: stage a private copy
+            # so the original is never touched. Reuse the batch staging dir
+            # when the caller supplies one; the run_id keeps names unique.
+            if tmp_root is not None:
+                working_file = tmp_root / f"{run_id}{file_path.suffix}"
+                try:
+                    shutil.copyfile(file_path, working_file)
+                    plugin_results = self._run_plugins(plugins, working_file)
+                    if file_out is not None:
+                        self._copy_output(working_file, file_out)
+                finally:
+                    working_file.unlink(missing_ok=True)
+            else:
+                with tempfile.TemporaryDirectory(prefix="pipeline_") as tmp_dir:
+                    working_file = Path(tmp_dir) / file_path.name
+                    shutil.copyfile(file_path, working_file)
+                    plugin_results = self._run_plugins(plugins, working_file)
+                    if file_out is not None:
+                        self._copy_output(working_file, file_out)
+        else:
+            # Read-only validators: run them against the original in place
+            # and hard-link the output, skipping both data copies. A plugin
+            # that wrote its result elsewhere advertises it via `produced`.
+            plugin_results = self._run_plugins(plugins, file_path)
+            if file_out is not None:
+                source = next(
+                    (r.produced for r in plugin_results if r.produced), file_path
+                )
+                self._link_or_copy(source, file_out)
+        report = self._generate_report(
+            file_path,
+            plugin_results,
+            run_id=run_id,
+            file_out=file_out,
+            timestamp_iso=timestamp_iso,
+        )
+        if file_out is not None:
+            self._save_json_report(report, file_out)
+        self._append_aggregated_log(report, timestamp_iso)
+        self._hash_cache.mark_validated(
+            file_path,
+            had_errors=report.summary["total_errors"] > 0,
+            timestamp_iso=timestamp_iso,
+        )
+        return report
+
+    def _run_plugins(self, plugins: List[Any], file_path: Path) -> List[PluginResult]:
+        """Execute the supplied plugins against the given file."""
+        return self._plugin_manager.run_plugins(plugins, file_path)
+
+    def _copy_output(self, source: Path, destination: Path) -> None:
+        """Copy data to the output path, preserving metadata only on request.
+
+        ``copyfile`` alone stays on the zero-copy ``sendfile`` fast path on
+        Linux; ``copy2`` semantics (the extra stat + copystat) are applied
+        only when the engine was built with ``preserve_metadata``.
+        """
+        shutil.copyfile(source, destination)
+        if self.preserve_metadata:
+            shutil.copystat(source, destination)
+
+    def _link_or_copy(self, source: Path, destination: Path) -> None:
+        """Hard-link ``source`` to ``destination``, copying across devices.
+
+        The destination may already exist as a hard link to an input file
+        (a prior run's output), so data is never written through the
+        destination path directly: an EEXIST collision replaces the stale
+        entry and re-links, and the cross-device fallback copies into a
+        private temp file and renames it over the target. Either way only
+        the directory entry changes and the old inode's data is untouched.
+        """
+        try:
+            os.link(source, destination)
+            return
+        except FileExistsError:
+            destination.unlink(missing_ok=True)
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                pass
+        except OSError:
+            pass
+        fd, tmp_name = tempfile.mkstemp(
+            dir=str(destination.parent), prefix=".tmp_", suffix=destination.suffix
+        )
+        os.close(fd)
+        try:
+            self._copy_output(source, Path(tmp_name))
+            os.replace(tmp_name, destination)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
 
     def _generate_report(
         self,
         file_path: Path,
         plugin_results: List[PluginResult],
         run_id: Optional[str] = None,
+        file_out: Optional[Path] = None,
+        timestamp_iso: Optional[str] = None,
     ) -> PipelineReport:
         """Create the final report structure returned to the GUI layer."""
-        raise NotImplementedError("PipelineEngine._generate_report is not implemented yet")
+        if timestamp_iso is None:
+            timestamp_iso = datetime.now(timezone.utc).isoformat()
+        total_errors = 0
+        total_warnings = 0
+        auto_fixed = 0
+        for result in plugin_results:
+            auto_fixed += result.auto_fixed
+            for error in result.errors:
+                if error.severity == "error":
+                    total_errors += 1
+                elif error.severity == "warning":
+                    total_warnings += 1
+        summary: Dict[str, Any] = {
+            "status": "ok" if all(r.success for r in plugin_results) else "failed",
+            "timestamp_utc": timestamp_iso,
+            "plugins_run": len(plugin_results),
+            "total_errors": total_errors,
+            "total_warnings": total_warnings,
+            "auto_fixed": auto_fixed,
+        }
+        return PipelineReport(
+            file_in=file_path,
+            file_out=file_out,
+            run_id=run_id or self._generate_ulid(),
+            plugin_results=plugin_results,
+            summary=summary,
+        )
+
+    def _save_json_report(self, report: PipelineReport, file_out: Path) -> None:
+        """Write the per-file JSON report next to the validated output."""
+        payload = {
+            "run_id": report.run_id,
+            "file_in": str(report.file_in),
+            "file_out": str(report.file_out),
+            "summary": report.summary,
+            "plugin_results": [result.to_dict() for result in report.plugin_results],
+        }
+        report_path = file_out.with_name(file_out.name + ".json")
+        report_path.write_text(
+            json.dumps(payload, indent=2, sort_keys=True, default=str),
+            encoding="utf-8",
+        )
+
+    def _append_aggregated_log(self, report: PipelineReport, timestamp_iso: str) -> None:
+        """Append one record per validation error to the shared JSONL log."""
+        if self.aggregated_log is None:
+            return
+        file_out = str(report.file_out) if report.file_out else None
+        records = [
+            {
+                "run_id": report.run_id,
+                "file_out": file_out,
+                "tool": error.tool,
+                "severity": error.severity,
+                "code": error.code,
+                "line": error.line,
+                "message": error.message,
+                "auto_fixed": error.auto_fixed,
+                "ts": timestamp_iso,
+            }
+            for result in report.plugin_results
+            for error in result.errors
+        ]
+        # One buffered write (and one rotation check) per file instead of
+        # one per error record.
+        self.aggregated_log.append_many(records)
+
+    def _generate_ulid(self) -> str:
+        """Generate a ULID: 48-bit timestamp + 80 random bits, Crockford base32."""
+        millis = time.time_ns() // 1_000_000
+        time_part = bytes(
+            _CROCKFORD32_BYTES[(millis >> shift) & 0x1F] for shift in _ULID_TIME_SHIFTS
+        )
+        random_part = os.urandom(16).translate(_ULID_RANDOM_LUT)
+        return (time_part + random_part).decode("ascii")
@@ -1,48 +1,261 @@
-"""Plugin discovery and execution scaffolding."""
+"""Plugin discovery, dependency ordering, and execution."""
 from __future__ import annotations
 
+import importlib.util
+import os
+import sys
+import threading
+from graphlib import TopologicalSorter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from src.utils.types import PluginManifest, PluginResult
+from src.plugins.base_plugin import BasePlugin, ResultCache
+from src.utils.types import PluginResult
+
+
+class _LazyPlugin(BasePlugin):
+    """Manifest-backed stand-in that imports ``plugin.py`` on first run.
+
+    Discovery only needs manifest metadata (id, extensions, requires, tool
+    command), so the plugin module body — including any expensive imports —
+    is deferred until the plugin actually executes. A batch of JSON files
+    never pays for the YAML plugin's imports.
+    """
+
+    def __init__(
+        self,
+        manifest_path: Path,
+        module: ModuleType,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
+        super().__init__(manifest_path, result_cache=result_cache)
+        # Mutability must be known before execution so the engine can plan
+        # staging, hence it comes from the manifest rather than the class.
+        self.mutates_input = bool(self.manifest.get("mutates_input", True))
+        self._module = module
+        self._real: Optional[BasePlugin] = None
+        # LazyLoader's deferred exec_module is not safe to trigger from two
+        # threads at once; materialization is serialized through this lock.
+        self._materialize_lock = threading.Lock()
+
+    def _materialize(self) -> BasePlugin:
+        if self._real is not None:
+            return self._real
+        with self._materialize_lock:
+            if self._real is None:
+                # First attribute access on the module triggers LazyLoader's
+                # deferred exec_module.
+                register = getattr(self._module, "register", None)
+                if register is None:
+                    raise ImportError(
+                        f"Plugin {self.manifest_path.parent.name} has no register() function"
+                    )
+                real = register()
+                if not isinstance(real, BasePlugin):
+                    raise TypeError(
+                        f"Plugin {self.manifest_path.parent.name} register() "
+                        "must return a BasePlugin"
+                    )
+                # register() factories take no arguments, so the manager's
+                # shared memo is handed to the real plugin here.
+                real._result_cache = self._result_cache
+                self._real = real
+        return self._real
+
+    def build_command(self, file_path: Path):
+        return self._materialize().build_command(file_path)
+
+    def parse_output(self, stdout: str, stderr: str, returncode: int, file_path: Path):
+        return self._materialize().parse_output(stdout, stderr, returncode, file_path)
+
+    def execute(self, file_path: Path) -> PluginResult:
+        return self._materialize().execute(file_path)
 
 
 class PluginManager:
     """Loads plugins from the ``src/plugins`` package and prepares them for use."""
 
-    def __init__(self, plugins_path: Optional[Path] = None) -> None:
+    #: Plugin modules keyed by source path, tagged with the file's mtime so
+    #: edits invalidate the entry. Class-level: repeat discovery — including
+    #: across manager instances — reuses an already-built (and possibly
+    #: already-executed) module instead of re-running its top-level code.
+    _module_cache: Dict[str, Tuple[int, ModuleType]] = {}
+
+    def __init__(
+        self,
+        plugins_path: Optional[Path] = None,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
         self._plugins_path = plugins_path or Path(__file__).resolve().parent.parent / "plugins"
+        # One bounded memo shared by every plugin this manager loads, so
+        # re-validating unchanged bytes skips the subprocess entirely.
+        self._result_cache = result_cache if result_cache is not None else ResultCache()
         self._plugins: Dict[str, BasePlugin] = {}
+        # Registration-order tuple refreshed on register; hot paths iterate
+        # this instead of a dict view.
+        self._plugins_snapshot: Tuple[BasePlugin, ...] = ()
+        # Per-suffix dispatch table rebuilt on register so the per-file
+        # lookup is a single dict.get instead of a scan over all plugins.
+        self._by_suffix: Dict[str, Tuple[BasePlugin, ...]] = {}
+        self._wildcard: Tuple[BasePlugin, ...] = ()
+        # Topological order memoized per suffix; applicability is keyed on
+        # suffix, so two files with the same extension always share an order.
+        self._order_cache: Dict[str, List[BasePlugin]] = {}
+        # Size-1 LRU over the sort itself: distinct suffixes that map to
+        # the same applicable set (e.g. .yml/.yaml) share one computed order.
+        self._last_order_key: Optional[Tuple[str, ...]] = None
+        self._last_ordered: List[BasePlugin] = []
+        self._discover_mtime: Optional[int] = None
 
     def discover(self) -> None:
-        """Search the plugins directory and register available plugins."""
-        raise NotImplementedError("Plugin discovery has not been implemented")
+        """Search the plugins directory and register available plugins.
 
-    def get_plugins_for_file(self, file_path: Path) -> List["BasePlugin"]:
-        """Return plugins applicable to the supplied file path."""
-        raise NotImplementedError("Plugin filtering has not been implemented")
+        Repeat calls are a no-op while the plugins directory mtime is
+        unchanged, so long-running GUI sessions and repeated CLI runs do
+        not re-parse an unchanged plugin set.
+        """
+        if not self._plugins_path.is_dir():
+            return
+        dir_mtime = self._plugins_path.stat().st_mtime_ns
+        if dir_mtime == self._discover_mtime and self._plugins:
+            return
+        self._discover_mtime = dir_mtime
+        # scandir returns type info from the directory read itself, so the
+        # is-dir check costs no extra stat per child; only the two manifest
+        # file checks hit the filesystem again.
+        with os.scandir(self._plugins_path) as entries:
+            candidates = sorted(entries, key=lambda entry: entry.name)
+            for entry in candidates:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                manifest = os.path.join(entry.path, "manifest.json")
+                plugin_py = os.path.join(entry.path, "plugin.py")
+                if not (os.path.isfile(manifest) and os.path.isfile(plugin_py)):
+                    continue
+                try:
+                    plugin = self._load_plugin(Path(manifest))
+                except Exception:  # noqa: BLE001 - a broken plugin must not block discovery
+                    continue
+                if plugin.check_tool_available():
+                    self.register(plugin)
 
-    def _load_plugin(self, manifest_path: Path) -> "BasePlugin":
-        """Load a plugin using its manifest definition."""
-        raise NotImplementedError("Plugin loading has not been implemented")
+    def register(self, plugin: BasePlugin) -> None:
+        """Add a plugin and rebuild the suffix dispatch table."""
+        self._plugins[plugin.plugin_id] = plugin
+        self._plugins_snapshot = tuple(self._plugins.values())
+        self._rebuild_suffix_map()
+        self._order_cache.clear()
+        self._last_order_key = None
+        self._last_ordered = []
 
-    def run_plugins(self, plugins: Iterable["BasePlugin"], file_path: Path) -> List[PluginResult]:
-        """Execute the provided plugins sequentially."""
-        raise NotImplementedError("Plugin execution has not been implemented")
+    def get_all_plugins(self) -> List[BasePlugin]:
+        """Return every registered plugin in registration order."""
+        return list(self._plugins_snapshot)
+
+    def applicable_plugins(self, file_path: Path) -> List[BasePlugin]:
+        """Return plugins whose extension filter matches the file's suffix."""
+        suffix = file_path.suffix.lower()
+        return list(self._by_suffix.get(suffix, self._wildcard))
 
+    def ordered_plugins(self, file_path: Path) -> List[BasePlugin]:
+        """Return applicable plugins in dependency (topological) order.
 
-class BasePlugin:
-    """Base class for validator plugins referenced throughout the documentation."""
+        The sort is memoized per suffix: graph construction and
+        ``TopologicalSorter.static_order`` run once per distinct extension
+        rather than once per file. ``register`` invalidates the cache.
+        """
+        suffix = file_path.suffix.lower()
+        cached = self._order_cache.get(suffix)
+        if cached is not None:
+            return cached
+        # One pass over the dispatch tuple builds the graph, the id->plugin
+        # mapping, and the edge check together, instead of re-walking the
+        # applicable set once per structure.
+        applicable = self._by_suffix.get(suffix, self._wildcard)
+        graph: Dict[str, List[str]] = {}
+        mapping: Dict[str, BasePlugin] = {}
+        has_edges = False
+        for plugin in applicable:
+            requires = list(plugin.requires)
+            if requires:
+                has_edges = True
+            graph[plugin.plugin_id] = requires
+            mapping[plugin.plugin_id] = plugin
+        if not has_edges:
+            # No dependency edges: registration order is already a valid
+            # topological order, so skip the sorter entirely.
+            ordered = list(applicable)
+            self._order_cache[suffix] = ordered
+            return ordered
+        key = tuple(sorted(mapping))
+        if key == self._last_order_key:
+            self._order_cache[suffix] = self._last_ordered
+            return self._last_ordered
+        ordered_ids = list(TopologicalSorter(graph).static_order())
+        ordered = [mapping[pid] for pid in ordered_ids if pid in mapping]
+        self._order_cache[suffix] = ordered
+        self._last_order_key = key
+        self._last_ordered = ordered
+        return ordered
+
+    def get_plugins_for_file(self, file_path: Path) -> List[BasePlugin]:
+        """Return plugins applicable to the supplied file path, ordered."""
+        return self.ordered_plugins(file_path)
+
+    def run_plugins(
+        self, plugins: Iterable[BasePlugin], file_path: Path
+    ) -> List[PluginResult]:
+        """Execute the provided plugins sequentially."""
+        return [plugin.execute(file_path) for plugin in plugins]
 
-    plugin_id: str
-    manifest: PluginManifest
-    name: str
+    def _rebuild_suffix_map(self) -> None:
+        """Precompute, per file extension, the tuple of applicable plugins."""
+        by_suffix: Dict[str, List[BasePlugin]] = {}
+        wildcard: List[BasePlugin] = []
+        for plugin in self._plugins_snapshot:
+            if not plugin.enabled:
+                continue
+            extensions = plugin.file_extensions
+            if not extensions:
+                wildcard.append(plugin)
+            else:
+                for ext in extensions:
+                    by_suffix.setdefault(ext, []).append(plugin)
+        self._wildcard = tuple(wildcard)
+        # Wildcard plugins apply to every suffix, so bake them into each
+        # per-suffix tuple; unknown suffixes fall back to the wildcard set.
+        self._by_suffix = {
+            ext: tuple(plugins) + self._wildcard for ext, plugins in by_suffix.items()
+        }
 
-    def build_command(self, file_path: Path) -> List[str]:  # pragma: no cover - placeholder
-        raise NotImplementedError
+    def _load_plugin(self, manifest_path: Path) -> BasePlugin:
+        """Load a plugin using its manifest definition.
 
-    def check_tool_available(self) -> bool:  # pragma: no cover - placeholder
-        raise NotImplementedError
+        The plugin module is wrapped in ``importlib.util.LazyLoader`` and the
+        returned plugin is a manifest-backed proxy, so the module body only
+        executes the first time the plugin fires.
+        """
+        plugin_dir = manifest_path.parent
+        module = self._import_plugin_module(plugin_dir)
+        return _LazyPlugin(manifest_path, module, result_cache=self._result_cache)
 
-    def execute(self, file_path: Path) -> PluginResult:  # pragma: no cover - placeholder
-        raise NotImplementedError
+    def _import_plugin_module(self, plugin_dir: Path) -> ModuleType:
+        """Create a lazily-executed module object for ``plugin_dir/plugin.py``."""
+        module_path = plugin_dir / "plugin.py"
+        mtime = os.stat(module_path).st_mtime_ns
+        cached = self._module_cache.get(str(module_path))
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        module_name = f"pipeline_plugins.{plugin_dir.name}"
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load plugin module from {plugin_dir}")
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        # Registered under a stable name so relative imports inside the
+        # plugin body resolve once the lazy module actually executes.
+        sys.modules[module_name] = module
+        self._module_cache[str(module_path)] = (mtime, module)
+        return module
@@ -0,0 +1,219 @@
+"""Tkinter front-end: file selection, background processing, live log."""
+from __future__ import annotations
+
+import os
+import queue
+import stat
+import threading
+import tkinter as tk
+from pathlib import Path
+from tkinter import filedialog, scrolledtext, ttk
+from typing import List, Optional
+
+from src.core.pipeline_engine import PipelineEngine
+
+try:  # Drag-and-drop is optional; the file picker always works.
+    from tkinterdnd2 import DND_FILES, TkinterDnD
+
+    _DND_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    _DND_AVAILABLE = False
+
+#: Per-batch cap on selected files; keeps a single run bounded.
+MAX_FILES = 10
+
+#: How often the UI thread drains messages posted by the worker thread.
+_QUEUE_POLL_MS = 100
+
+#: Statuses that count as failures when summarizing a finished batch.
+_BAD_STATUSES = frozenset({"failed", "missing", "error"})
+
+
+class ValidationPipelineGUI:
+    """Main window wiring user actions to the pipeline engine.
+
+    All pipeline work runs on a daemon thread; the worker posts messages
+    to a queue that the Tk thread drains on a timer, so widgets are only
+    ever touched from the UI thread.
+    """
+
+    def __init__(self, root: tk.Tk, engine: PipelineEngine) -> None:
+        self.root = root
+        self.engine = engine
+        self.files: List[Path] = []
+        # Companion set for O(1) dedupe; self.files keeps display order.
+        self._files_set: set[Path] = set()
+        self.output_dir: Optional[Path] = None
+        self._ui_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._build_widgets()
+        if _DND_AVAILABLE and isinstance(root, TkinterDnD.Tk):
+            self.file_list.drop_target_register(DND_FILES)
+            self.file_list.dnd_bind("<<Drop>>", self._on_drop)
+        self.root.after(_QUEUE_POLL_MS, self._drain_ui_queue)
+
+    def _build_widgets(self) -> None:
+        self.root.title("Validation Pipeline")
+        frame = ttk.Frame(self.root, padding=8)
+        frame.grid(sticky="nsew")
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+
+        self.file_list = tk.Listbox(frame, selectmode=tk.EXTENDED, height=8)
+        self.file_list.grid(row=0, column=0, columnspan=4, sticky="nsew")
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        ttk.Button(frame, text="Add Files", command=self._browse_files).grid(
+            row=1, column=0, sticky="w", pady=4
+        )
+        ttk.Button(frame, text="Remove Selected", command=self._remove_selected).grid(
+            row=1, column=1, sticky="w", pady=4
+        )
+        ttk.Button(frame, text="Clear", command=self._clear_files).grid(
+            row=1, column=2, sticky="w", pady=4
+        )
+        ttk.Button(frame, text="Output Folder...", command=self._choose_output_dir).grid(
+            row=1, column=3, sticky="e", pady=4
+        )
+
+        self.process_btn = ttk.Button(frame, text="Process", command=self.process_files)
+        self.process_btn.grid(row=2, column=0, columnspan=4, sticky="ew")
+
+        self.log_widget = scrolledtext.ScrolledText(
+            frame, height=10, state="disabled", wrap="word"
+        )
+        self.log_widget.grid(row=3, column=0, columnspan=4, sticky="nsew", pady=(8, 0))
+        frame.rowconfigure(3, weight=1)
+
+    # ------------------------------------------------------------------
+    # File selection
+
+    def _browse_files(self) -> None:
+        selection = filedialog.askopenfilenames(parent=self.root)
+        if selection:
+            self._add_files(selection)
+
+    def _on_drop(self, event) -> None:  # pragma: no cover - needs a display
+        self._add_files(self.root.tk.splitlist(event.data))
+
+    def _add_files(self, raw_paths) -> None:
+        """Add regular files to the batch, skipping duplicates and misses.
+
+        One os.stat per candidate answers both "exists" and "is a regular
+        file", and membership goes through the companion set, so large
+        drops stay linear in the number of paths.
+        """
+        for raw in raw_paths:
+            path = Path(raw)
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._append_log(f"Skipped (unreadable): {path}")
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            if path in self._files_set:
+                continue
+            if len(self.files) >= MAX_FILES:
+                self._append_log(f"Batch limit of {MAX_FILES} files reached")
+                break
+            self.files.append(path)
+            self._files_set.add(path)
+            self.file_list.insert(tk.END, str(path))
+
+    def _remove_selected(self) -> None:
+        for index in reversed(self.file_list.curselection()):
+            removed = self.files.pop(index)
+            self._files_set.discard(removed)
+            self.file_list.delete(index)
+
+    def _clear_files(self) -> None:
+        self.files.clear()
+        self._files_set.clear()
+        self.file_list.delete(0, tk.END)
+
+    def _choose_output_dir(self) -> None:
+        selection = filedialog.askdirectory(parent=self.root)
+        if selection:
+            self.output_dir = Path(selection)
+            self._append_log(f"Output folder: {self.output_dir}")
+
+    # ------------------------------------------------------------------
+    # Processing
+
+    def process_files(self) -> None:
+        """Kick off a validation batch on a background thread."""
+        if not self.files:
+            self._append_log("No files selected")
+            return
+        self.process_btn.config(state=tk.DISABLED)
+        thread = threading.Thread(target=self._process_thread, daemon=True)
+        thread.start()
+
+    def _process_thread(self) -> None:
+        try:
+            reports = self.engine.process_files(
+                list(self.files), output_dir=self.output_dir
+            )
+            results = [
+                {"file": str(r.file_in), "status": r.summary.get("status", "error")}
+                for r in reports
+            ]
+            for result in results:
+                self._ui_queue.put(("log", f"{result['status']}: {result['file']}"))
+            self._ui_queue.put(("processing-done", results))
+        except Exception as exc:  # noqa: BLE001 - surfaced to the log widget
+            self._ui_queue.put(("processing-error", str(exc)))
+
+    # ------------------------------------------------------------------
+    # UI-thread plumbing
+
+    def _drain_ui_queue(self) -> None:
+        """Apply worker-thread messages on the Tk thread.
+
+        Log payloads accumulated during one drain are joined into a single
+        widget insert — one configure/insert/see round-trip per tick
+        instead of one per message. Terminal messages are handled after
+        the logs they follow.
+        """
+        log_batch: List[str] = []
+        terminal_msgs: List[tuple] = []
+        while True:
+            try:
+                kind, payload = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "log":
+                log_batch.append(payload)
+            else:
+                terminal_msgs.append((kind, payload))
+        if log_batch:
+            self._append_log("\n".join(log_batch))
+        for kind, payload in terminal_msgs:
+            if kind == "processing-done":
+                self._on_processing_done(payload)
+            elif kind == "processing-error":
+                self._on_processing_error(payload)
+        self.root.after(_QUEUE_POLL_MS, self._drain_ui_queue)
+
+    def _append_log(self, message: str) -> None:
+        self.log_widget.configure(state="normal")
+        self.log_widget.insert(tk.END, message + "\n")
+        self.log_widget.see(tk.END)
+        self.log_widget.configure(state="disabled")
+
+    def _on_processing_done(self, results: List[dict]) -> None:
+        success = sum(1 for r in results if r.get("status") not in _BAD_STATUSES)
+        self._append_log(f"Done: {success}/{len(results)} files ok")
+        self.process_btn.config(state=tk.NORMAL)
+
+    def _on_processing_error(self, message: str) -> None:
+        self._append_log(f"Pipeline error: {message}")
+        self.process_btn.config(state=tk.NORMAL)
+
+
+def create_root() -> tk.Tk:
+    """Return the Tk root, drag-and-drop capable when tkinterdnd2 is present."""
+    if _DND_AVAILABLE:
+        return TkinterDnD.Tk()
+    return tk.Tk()
@@ -0,0 +1,279 @@
+"""Base class and execution helpers for validator plugins."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, MutableMapping, Optional, Sequence, Tuple, Union
+
+from src.utils.types import PluginManifest, PluginResult, ValidationError
+
+try:  # simdjson tokenizes with SIMD and only materializes accessed values.
+    import simdjson as _simdjson
+except ImportError:  # pragma: no cover - optional dependency
+    _simdjson = None
+
+try:  # orjson decodes in C, well ahead of stdlib json.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+#: Hard cap on a single tool invocation.
+DEFAULT_TIMEOUT_S = 120
+
+@lru_cache(maxsize=256)
+def _shlex_split(command: str) -> Tuple[str, ...]:
+    """Memoized shell-style tokenization.
+
+    The same command string recurs constantly (same tool, different
+    target injected later), and shlex is a pure-Python state machine;
+    caching skips the re-tokenization. Entries are retained, so callers
+    must not embed secrets in shell strings.
+    """
+    return tuple(shlex.split(command))
+
+
+#: Shared simdjson parser; reused so its internal buffer is allocated once.
+#: Discovery runs on one thread, and as_dict() copies out eagerly, so the
+#: buffer reuse between parses is safe.
+_manifest_parser = _simdjson.Parser() if _simdjson is not None else None
+
+
+def _load_manifest(manifest_path: Path) -> PluginManifest:
+    """Parse a manifest file with the fastest decoder available."""
+    data = manifest_path.read_bytes()
+    if _manifest_parser is not None:
+        return _manifest_parser.parse(data).as_dict()
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+class ResultCache(MutableMapping[Tuple[str, str], PluginResult]):
+    """Bounded, thread-safe LRU of plugin results.
+
+    Keys are ``(plugin_id, content hash)`` pairs; the least recently used
+    entry is evicted once ``maxsize`` is reached, so a long session's memo
+    never grows without bound. Plugin execution runs on multiple worker
+    threads, hence the lock around every access.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple[str, str], PluginResult]" = OrderedDict()
+
+    def __getitem__(self, key: Tuple[str, str]) -> PluginResult:
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Tuple[str, str], value: PluginResult) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        with self._lock:
+            return iter(tuple(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class BasePlugin:
+    """Base class for validator plugins driven by a ``manifest.json``.
+
+    Subclasses implement :meth:`build_command` and :meth:`parse_output`;
+    everything else (environment scrubbing, timeouts, error capture) is
+    handled here so plugin execution stays deterministic and stateless.
+    """
+
+    #: Whether the plugin may rewrite the file it is given. Read-only
+    #: validators should override this with ``False`` so the engine can skip
+    #: temp-dir staging entirely.
+    mutates_input: bool = True
+
+    def __init__(
+        self,
+        manifest_path: Path,
+        result_cache: Optional[MutableMapping[Tuple[str, str], PluginResult]] = None,
+    ) -> None:
+        self.manifest_path = Path(manifest_path)
+        self.manifest: PluginManifest = _load_manifest(self.manifest_path)
+        self.plugin_id: str = self.manifest["plugin_id"]
+        self.name: str = self.manifest.get("name", self.plugin_id)
+        self.enabled: bool = bool(self.manifest.get("enabled", True))
+        self.auto_fix: bool = bool(self.manifest.get("auto_fix", False))
+        # Manifests are immutable after construction, so the list-valued
+        # fields are resolved once into tuples here instead of re-reading
+        # the manifest dict on every property access.
+        self._file_extensions: Tuple[str, ...] = tuple(
+            ext.lower() for ext in self.manifest.get("file_extensions", [])
+        )
+        self._requires: Tuple[str, ...] = tuple(self.manifest.get("requires", ()))
+        # Suffix membership is checked once per file per plugin; resolve it
+        # to a frozenset here so can_process is a single hashed lookup.
+        self._ext_set: frozenset[str] = frozenset(self._file_extensions)
+        # Optional memo of results keyed by (plugin_id, content hash). Any
+        # mutable mapping works, so callers can bound memory with an LRU.
+        # Only consulted for read-only plugins: a mutating run must really
+        # execute, since its effect is the rewritten file.
+        self._result_cache = result_cache
+
+    @property
+    def file_extensions(self) -> Tuple[str, ...]:
+        """Lower-cased suffixes this plugin handles; empty means any file."""
+        return self._file_extensions
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        """Plugin ids that must run before this one."""
+        return self._requires
+
+    def can_process(self, file_path: Path) -> bool:
+        """Return ``True`` when this plugin should run for the given file."""
+        return self.enabled and (
+            not self._ext_set or file_path.suffix.lower() in self._ext_set
+        )
+
+    def build_command(self, file_path: Path) -> List[str]:
+        """Return the argv to execute for ``file_path``."""
+        raise NotImplementedError
+
+    def parse_output(
+        self,
+        stdout: str,
+        stderr: str,
+        returncode: int,
+        file_path: Path,
+    ) -> List[ValidationError]:
+        """Translate raw tool output into :class:`ValidationError` objects."""
+        raise NotImplementedError
+
+    def check_tool_available(self) -> bool:
+        """Return ``True`` when the external tool can be found on PATH."""
+        command = self.manifest.get("tool", {}).get("command")
+        if not command:
+            return True
+        return shutil.which(command) is not None
+
+    def run_subprocess(
+        self,
+        command: Union[str, Sequence[str]],
+        cwd: Optional[Path] = None,
+        timeout: int = DEFAULT_TIMEOUT_S,
+        close_fds: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """Run a tool with a scrubbed environment and no shell.
+
+        ``close_fds`` defaults to off: leaving inheritable-fd handling to
+        the O_CLOEXEC defaults lets CPython use the cheaper posix_spawn
+        path instead of walking the fd table on every launch. Callers that
+        hold sensitive non-CLOEXEC descriptors can switch it back on.
+        """
+        if isinstance(command, str):
+            command = _shlex_split(command)
+        env = os.environ.copy()
+        env["LC_ALL"] = "C"
+        env["LANG"] = "C"
+        env.pop("PYTHONPATH", None)
+        for key in list(env):
+            if key.upper().endswith("_PROXY"):
+                env.pop(key)
+        return subprocess.run(
+            list(command),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=str(cwd) if cwd is not None else None,
+            env=env,
+            shell=False,  # never shell=True: command injection risk
+            close_fds=close_fds,
+        )
+
+    def execute(self, file_path: Path) -> PluginResult:
+        """Run the tool against ``file_path`` and collect its findings."""
+        cache_key: Optional[Tuple[str, str]] = None
+        if self._result_cache is not None and not self.mutates_input:
+            cache_key = (
+                self.plugin_id,
+                hashlib.blake2b(file_path.read_bytes(), digest_size=32).hexdigest(),
+            )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                # Same plugin, same bytes: the whole subprocess round-trip
+                # collapses to this lookup.
+                return replace(cached, duration_s=0.0)
+        start = time.perf_counter()
+        try:
+            completed = self.run_subprocess(
+                self.build_command(file_path), cwd=file_path.parent
+            )
+            errors = self.parse_output(
+                completed.stdout, completed.stderr, completed.returncode, file_path
+            )
+            success_codes = set(
+                self.manifest.get("tool", {}).get("success_codes", [0])
+            )
+            success = completed.returncode in success_codes
+            raw_output = completed.stdout
+        except subprocess.TimeoutExpired:
+            return PluginResult(
+                plugin_id=self.plugin_id,
+                name=self.name,
+                success=False,
+                duration_s=time.perf_counter() - start,
+                errors=[
+                    ValidationError(
+                        tool=self.name,
+                        severity="error",
+                        message="Plugin execution timeout",
+                        file=file_path,
+                    )
+                ],
+            )
+        except Exception as exc:  # noqa: BLE001 - one plugin must not kill the run
+            return PluginResult(
+                plugin_id=self.plugin_id,
+                name=self.name,
+                success=False,
+                duration_s=time.perf_counter() - start,
+                errors=[
+                    ValidationError(
+                        tool=self.name,
+                        severity="error",
+                        message=f"Plugin failed: {exc}",
+                        file=file_path,
+                    )
+                ],
+            )
+        result = PluginResult(
+            plugin_id=self.plugin_id,
+            name=self.name,
+            success=success,
+            duration_s=time.perf_counter() - start,
+            auto_fixed=sum(1 for error in errors if error.auto_fixed),
+            errors=errors,
+            raw_output=raw_output,
+        )
+        if cache_key is not None:
+            self._result_cache[cache_key] = result
+        return result
@@ -0,0 +1,265 @@
+"""Append-only JSONL log with bounded size and atomic rotation."""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional
+
+try:  # orjson emits bytes with the newline appended in a single C pass.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+#: Rotation threshold; newest records are kept up to this many bytes.
+DEFAULT_MAX_BYTES = 75 * 1024
+
+#: Buffered records are flushed once either bound is hit, or when the
+#: latency timer fires, whichever comes first.
+_FLUSH_MAX_RECORDS = 64
+_FLUSH_MAX_BYTES = 32 * 1024
+_FLUSH_MAX_LATENCY_S = 1.0
+
+#: Read size used while sliding the kept tail during in-place rotation.
+_ROTATE_CHUNK = 64 * 1024
+
+
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """Serialize one record to a newline-terminated JSON line."""
+    if _orjson is not None:
+        return _orjson.dumps(
+            record, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_APPEND_NEWLINE
+        )
+    return (
+        json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n"
+    ).encode("utf-8")
+
+
+class JSONLManager:
+    """Writes one JSON record per line and rotates the file atomically."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        durable: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        # When off, rotation skips fsync (milliseconds on most disks);
+        # fine for logs that tolerate losing the newest records in a crash.
+        self._durable = durable
+        # A muted manager drops records before serialization, so callers
+        # can leave logging calls in place at zero per-record cost.
+        self.enabled: bool = True
+        self._lock = threading.Lock()
+        # Kept open across appends; the byte counter mirrors the file size
+        # so the rotation check costs no stat on the hot path.
+        self._handle: Optional[BinaryIO] = None
+        self._size: int = 0
+        # Records accumulate here and hit the file in one write per flush;
+        # the timer bounds how long a record can sit buffered.
+        self._buffer: list[bytes] = []
+        self._buffered_bytes: int = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.close)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a single record and rotate if the file exceeds the cap."""
+        self.append_many((record,))
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Buffer a batch of records, flushing once thresholds are crossed.
+
+        Records are serialized up front but written lazily: they sit in an
+        in-memory buffer until it holds 64 records or 32 KiB, so the write
+        syscall and rotation check are amortized over many appends. A
+        one-second timer bounds how stale a buffered record can get, and
+        ``flush``/``close`` force everything out.
+        """
+        if not self.enabled:
+            return
+        lines = [_dumps_line(record) for record in records]
+        if not lines:
+            return
+        with self._lock:
+            self._buffer.extend(lines)
+            self._buffered_bytes += sum(len(line) for line in lines)
+            if (
+                len(self._buffer) >= _FLUSH_MAX_RECORDS
+                or self._buffered_bytes >= _FLUSH_MAX_BYTES
+            ):
+                self._flush_locked()
+            elif self._flush_timer is None:
+                timer = threading.Timer(_FLUSH_MAX_LATENCY_S, self.flush)
+                timer.daemon = True
+                timer.start()
+                self._flush_timer = timer
+
+    def append_lazy(self, factory: Callable[[], Dict[str, Any]]) -> None:
+        """Append the record ``factory`` produces, building it only if enabled.
+
+        Lets callers defer expensive record construction the same way
+        stdlib logging defers message formatting.
+        """
+        if not self.enabled:
+            return
+        self.append(factory())
+
+    def flush(self) -> None:
+        """Write any buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush buffered records and release the persistent file handle."""
+        with self._lock:
+            self._flush_locked()
+            self._close_handle()
+
+    def _flush_locked(self) -> None:
+        """Drain the buffer with one write; caller must hold ``self._lock``."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        handle = self._ensure_handle()
+        written = handle.write(data)
+        # Drains are infrequent, so pushing through the OS buffer here is
+        # cheap and keeps flush()'s "on disk now" promise honest.
+        handle.flush()
+        self._size += written
+        if self._size > self.max_bytes:
+            self._close_handle()
+            # The manager is the sole writer, so the counter is the file
+            # size: hand it to rotation rather than paying a fresh stat.
+            self._rotate_if_needed(self._size)
+
+    def _ensure_handle(self) -> BinaryIO:
+        """Return the open append handle, creating it on first use.
+
+        Caller must hold ``self._lock``. The size counter is seeded from
+        one stat at open time and maintained incrementally afterwards.
+        """
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "ab")
+            try:
+                self._size = self.path.stat().st_size
+            except OSError:
+                self._size = 0
+        return self._handle
+
+    def _close_handle(self) -> None:
+        """Close the persistent handle; caller must hold ``self._lock``."""
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            finally:
+                self._handle = None
+
+    def _rotate_if_needed(self, current_size: Optional[int] = None) -> None:
+        """Trim the log to the newest ``max_bytes`` worth of whole lines.
+
+        The flush path passes ``current_size`` from its byte counter so no
+        stat happens here; when called without one (cold start against an
+        existing oversized file) the size is fetched once.
+
+        The fast path slides the tail to the front of the existing file
+        with pread/pwrite and truncates — no tempfile, fsync-and-replace,
+        or directory update. If that fails (exotic filesystems, permission
+        oddities) the copy-through-tempfile path takes over. Work is
+        bounded by the cap no matter how large the file has grown.
+        """
+        if current_size is None:
+            try:
+                current_size = self.path.stat().st_size
+            except OSError:
+                return
+        if current_size <= self.max_bytes:
+            return
+        try:
+            self._rotate_in_place(current_size)
+        except OSError:
+            self._rotate_via_tempfile(current_size)
+
+    def _rotate_in_place(self, size: int) -> None:
+        """Memmove the newest whole lines to offset 0 and truncate."""
+        fd = os.open(self.path, os.O_RDWR)
+        try:
+            # Align the tail start on a whole line: scan forward from
+            # size - max_bytes for the first newline.
+            start = size - self.max_bytes
+            while True:
+                chunk = os.pread(fd, _ROTATE_CHUNK, start)
+                if not chunk:
+                    # No newline in the tail at all; drop everything.
+                    os.ftruncate(fd, 0)
+                    self._size = 0
+                    return
+                newline = chunk.find(b"\n")
+                if newline >= 0:
+                    start += newline + 1
+                    break
+                start += len(chunk)
+            # Copy forward in chunks. Each write ends before the next read
+            # begins, so the shifting regions never clobber unread bytes.
+            dest = 0
+            src = start
+            while src < size:
+                chunk = os.pread(fd, _ROTATE_CHUNK, src)
+                if not chunk:
+                    break
+                os.pwrite(fd, chunk, dest)
+                dest += len(chunk)
+                src += len(chunk)
+            os.ftruncate(fd, dest)
+            if self._durable:
+                os.fsync(fd)
+            self._size = dest
+        finally:
+            os.close(fd)
+
+    def _rotate_via_tempfile(self, size: int) -> None:
+        """Copy the tail through a tempfile and atomically replace the log."""
+        with self.path.open("rb") as handle:
+            handle.seek(size - self.max_bytes)
+            tail = handle.read()
+        # The seek almost certainly landed mid-record; drop up to and
+        # including the first newline so the file starts on a whole line.
+        tail = tail[tail.find(b"\n") + 1 :]
+        fd, tmp_name = tempfile.mkstemp(
+            dir=str(self.path.parent), prefix=".tmp_", suffix=".jsonl"
+        )
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(tail)
+                handle.flush()
+                if self._durable:
+                    os.fsync(handle.fileno())
+            # Rename relative to an open directory fd so the kernel skips
+            # re-resolving the parent path for both names.
+            dir_fd = os.open(self.path.parent, os.O_DIRECTORY)
+            try:
+                os.replace(
+                    os.path.basename(tmp_name),
+                    self.path.name,
+                    src_dir_fd=dir_fd,
+                    dst_dir_fd=dir_fd,
+                )
+            finally:
+                os.close(dir_fd)
+            self._size = len(tail)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
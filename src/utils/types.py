@@ -1,12 +1,27 @@
 """Shared type stubs consumed across the provisional code base."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
+#: Serialized field order, fixed at module scope so to_dict is a plain
+#: getattr loop instead of dataclasses.asdict's recursive deep copy.
+_ERR_KEYS = (
+    "tool",
+    "severity",
+    "message",
+    "file",
+    "line",
+    "column",
+    "code",
+    "auto_fixed",
+    "extra",
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class ValidationError:
     """Represents a single issue reported by a plugin."""
 
@@ -20,8 +35,18 @@ class ValidationError:
     auto_fixed: Optional[bool] = None
     extra: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # tool and severity draw from a tiny vocabulary ("error",
+        # "warning", a few tool names); interning makes every error share
+        # one str per value and lets hot filters compare by identity.
+        self.tool = sys.intern(self.tool)
+        self.severity = sys.intern(self.severity)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in _ERR_KEYS}
 
-@dataclass
+
+@dataclass(slots=True)
 class PluginResult:
     """Container returned by plugins after execution."""
 
@@ -32,9 +57,24 @@ class PluginResult:
     auto_fixed: int = 0
     errors: List[ValidationError] = field(default_factory=list)
     raw_output: Optional[str] = None
+    #: Artifact a read-only plugin wrote somewhere other than the input;
+    #: when set, the engine copies it to the output instead of the input.
+    produced: Optional[Path] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "plugin_id": self.plugin_id,
+            "name": self.name,
+            "success": self.success,
+            "duration_s": self.duration_s,
+            "auto_fixed": self.auto_fixed,
+            "errors": [error.to_dict() for error in self.errors],
+            "raw_output": self.raw_output,
+            "produced": self.produced,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineReport:
     """Summary returned to the GUI layer for each processed file."""
 